@@ -43,6 +43,8 @@ if sys.version_info.major < 3:
 
 import socket
 import struct
+import bisect
+import functools
 
 import threading
 
@@ -63,37 +65,78 @@ DEBUG=True
 # scroll down to "dgpsdec_mc" for the main function
 
 
-def __calcpar_i(word):
-	par_contr = [0xBB1F3480,0x5D8F9A40,0xAEC7CD00,0x5763E680,0x6BB1F340,0x8B7A89C0]
+# parity patterns (one per parity bit, D25 to D30)
+par_contr = (0xBB1F3480,0x5D8F9A40,0xAEC7CD00,0x5763E680,0x6BB1F340,0x8B7A89C0)
 
-	pc=0
-	for exorpattern in par_contr:
-		pc <<= 1
-		pc += int('{:032b}'.format(int(word) & exorpattern).count('1'))%2
-	#end for
-	return pc
+
+# parity of all six patterns in one go (SWAR on a 192-bit int)
+# the word is copied in six 32-bit lanes, every lane is masked with its own
+# pattern and the bits of every lane are exor-ed together
+# the first pattern is in the highest lane (it gives the highest parity bit)
+__par_replicate=sum(1 << (32*i) for i in range(6))
+__par_masks=sum(p << (32*(5-i)) for i,p in enumerate(par_contr))
+
+# gather the lowest bit of every lane into bits 160 to 165 with one multiplication:
+# bit 32*k is multiplied by 2**(160-31*k) and lands on bit 160+k. All other
+# partial products land on distinct bits outside 160..165, so there are no carries
+__par_lsb=__par_replicate
+__par_gather=sum(1 << (160-31*i) for i in range(6))
+
+
+def __calcpar_i(word):
+	x=((word & 0xffffffff) * __par_replicate) & __par_masks
+
+	# exor-fold every lane into its lowest bit
+	# (the higher bits of a lane are polluted by the next lane, they are not used)
+	x ^= x >> 16
+	x ^= x >> 8
+	x ^= x >> 4
+	x ^= x >> 2
+	x ^= x >> 1
+
+	# parity = lowest bit of every lane
+	return (((x & __par_lsb) * __par_gather) >> 160) & 0x3f
 #end def
 
 
+# parity is linear over the bits of the word, so the parity of a word is the
+# exor of the parity of its four bytes
+# syndrome lookup-tables: one table of 256 entries per byte-position
+# the exor of the four lookups is 0 for a valid word. The tables work on the
+# word as received:
+# - flipping the data-bits (bit 30 is a '1') exors the parity with the parity of 0x3fffffc0
+# - the received parity bits (bits 5 to 0) are exor-ed with the calculated parity
+__syndrome0=tuple(__calcpar_i(v) ^ (v & 0x3f) for v in range(256))
+__syndrome1=tuple(__calcpar_i(v << 8) for v in range(256))
+__syndrome2=tuple(__calcpar_i(v << 16) for v in range(256))
+__syndrome3=tuple(__calcpar_i(v << 24) ^ (__calcpar_i(0x3fffffc0) if v & 0x40 else 0) for v in range(256))
+
+# the same, combined per 16-bit half of the word (two lookups per word)
+__syndromelo=bytes(__syndrome0[v & 0xff] ^ __syndrome1[v >> 8] for v in range(65536))
+__syndromehi=bytes(__syndrome2[v & 0xff] ^ __syndrome3[v >> 8] for v in range(65536))
+
+
 class __process_type9():
 	def __init__(self,removeold=5000):
 		self.all={}
+		self.sortedkeys=[] # keys of self.all, in sorted order
 		self.removeold=removeold
+		self.lastcleanup=0 # bit count of the last cleanup
 	#end __init
 
 	def update(self,satid,s,udre,psc,rrc,iod,tcount,msgtype):
 		key=(satid,iod)
 
-		#DEBUG code
+		# entry: [s,udre,psc,rrc,tcount,ncount] (a list, so it can be updated in place)
 		d=self.all.get(key)
 		if d is None:
 			if DEBUG: print("T{t}DEBUG add".format(t=msgtype),tcount,key)
-			ncount=1
+			bisect.insort(self.sortedkeys,key)
+			self.all[key]=[s,udre,psc,rrc,tcount,1]
 		else:
-			ncount=d[5]+1
+			d[0:5]=s,udre,psc,rrc,tcount
+			d[5]+=1
 		#end if
-
-		self.all[key]=(s,udre,psc,rrc,tcount,ncount)
 	#end def
 
 	def printall(self, msgtype):
@@ -104,7 +147,7 @@ class __process_type9():
 		def __ff(x):
 			return format(x,'>-6.2f')
 
-		for k in sorted(self.all.keys()):
+		for k in self.sortedkeys:
 			d=self.all[k]
 			print("T"+str(msgtype),d[4],__fd(k[0]),__fd(k[1]),__fd(d[0]),__fd(d[1]),__ff(d[2]),__ff(d[3]),__fd(d[5]))
 		#end for
@@ -117,40 +160,107 @@ class __process_type9():
 
 	def cleanup(self,cnt,msgtype):
 		o=cnt-self.removeold
-		tmp=self.all.copy()
-		changed=False
-		for k in self.all.keys():
-			d=self.all[k]
-			if d[4] < o:
-				if DEBUG: print("T{t}DEBUG del".format(t=msgtype),cnt,k,d[5])
-				del tmp[k]
-				changed=True
-			#end if
+
+		# remove entries that are too old
+		stale=[k for k,d in self.all.items() if d[4] < o]
+		if not stale: return
+
+		for k in stale:
+			if DEBUG: print("T{t}DEBUG del".format(t=msgtype),cnt,k,self.all[k][5])
+			del self.all[k]
 		#end for
 
-		if changed: self.all=tmp.copy()
+		self.sortedkeys=[k for k in self.sortedkeys if k in self.all]
+	#end cleanup
 #end class
 
-def __extractdata(v,fieldlist):
+def __fieldlayout(fieldlist):
+	"""
+	calculate the position of the fields in a message
+	params:
+		fieldlist: length (in bits) of the fields, most significant field first
+	returns:
+		tuple of (shift, mask) per field (mask is None for fields of length 0)
+	"""
 	ret=[]
+	shift=0
 
 	for f in fieldlist[::-1]:
 		if f > 0:	
-			mask=(2**f)-1
-
-			ret.append(v & mask)
-			v>>=f
+			ret.append((shift,(1 << f)-1))
+			shift+=f
 		else:
-			ret.append(None)
+			ret.append((shift,None))
 		#end else - if
-    #end for
+	#end for
+
+	return tuple(ret[::-1])
+#end def
+
+
+@functools.lru_cache(maxsize=None)
+def __makeunpacker(fieldlist):
+	"""
+	generate a function that extracts the fields of a message
+	(straight-line code: one shift and mask per field, no loop)
+	params:
+		fieldlist: length (in bits) of the fields, most significant field first
+	returns:
+		function: v -> tuple of the fields
+	the unpacker is generated once per fieldlist (cached)
+	"""
+	fields=["None" if mask is None else "(v >> {s}) & {m:#x}".format(s=shift,m=mask) for shift,mask in __fieldlayout(fieldlist)]
+	return eval("lambda v: (" + ", ".join(fields) + ",)")
+#end def
+
+
+# sign extension of a 'nbits' bit two's complement value (branchless)
+def __sext(x,nbits):
+	m=1 << (nbits-1)
+	return (x ^ m) - m
 
-	return ret[::-1]
+
+def __extractdata(v,fieldlist):
+	return __makeunpacker(tuple(fieldlist))(v)
 #end def
 
 
 
 
+# input bits as ascii '0' and '1' (for searching the preamble and for int(..,2))
+__bitchars=bytes(0x30 | (i & 0x01) for i in range(256))
+
+
+def __getframe(bits, w1,w2):
+	"""
+	shift one frame into w1 and w2 and check it
+	params:
+		bits: the 30 bits of the frame
+		w1,w2: words as received
+	returns:
+		w1,w2: words as received
+		data: the 24 data bits of the frame (None if the parity is not correct)
+	"""
+
+	# read bits into w1, copy 29th bit of w1 to 0th bit of w2
+	# after 30 bits, w2 contains the old w1 and w1 contains the last two bits
+	# of the old w1 followed by the 30 new bits
+	w2 = w1
+	w1 = ((w1 << 30) | int(bytes(bits).translate(__bitchars),2)) & 0xffffffff
+
+	# check parity
+	if __syndromelo[w1 & 0xffff] ^ __syndromehi[w1 >> 16]:
+		return w1,w2,None
+	#end if
+
+	# flip data-bits if last pre-bit (i.e. bit 30) is a '1'
+	w1f = w1 ^ 0x3fffffc0 if w1 & 0x40000000 else w1
+
+	# message = bits 29 to 6 (exclude two 'prebits' and parity)
+	return w1,w2,(w1f & 0x3fffffc0) >> 6
+#end getframe
+
+
 def __getdataframes(s, w1,w2,maxnumframe):
 	"""
 	get data frames
@@ -164,602 +274,723 @@ def __getdataframes(s, w1,w2,maxnumframe):
 		l: length
 	"""
 
-	l=0 # length
 	ret=[]
 
 	# read up to "maxnumframe"
 	for _ in range(maxnumframe):
-		msgin=s.get(30) # read 1 frame of 30 bits
+		# read 1 frame of 30 bits
+		w1,w2,data=__getframe(s.get(30),w1,w2)
 
-		# read bits into w1, invert order, copy 29th bit to w2
-		for c in msgin:
-			w2 = (w2 << 1) & 0xffffffff
-			if w1 & 0x20000000 != 0: w2 |= 1 # copy 29th bit from w1 to 0th bit of w2
-			w1 = ((w1 << 1) ^ (c&0x01)) & 0xffffffff
-		#end for (char)
+		# break out if parity error, store only if frame is valid
+		if data is None: break
+		ret.append(data)
+	#end for (msgword)
 
-		# flip data-bits if last pre-bit (i.e. bit 30) is a '1'
-		w1f = w1 ^ 0x3fffffc0 if w1 & 0x40000000 else w1
+	return w1,w2,ret,len(ret)
 
-		# calculate parity
-		par1=__calcpar_i(w1f)
+#end getdataframes
 
-		# message = bits 29 to 6 (exclude two 'prebits' and parity)
-		# store only if frame is valid
-		if par1 == (w1 & 0x0000003f):
-			ret.append((w1f & 0x3fffffc0 ) >> 6)
-			l+=1
-		else:
-			# break out if parity error
-			break
+
+def __scanbits(bits, w1,w2, synconly=False):
+	"""
+	shift bits into w1 and w2 until both words have a valid parity
+	params:
+		bits: input bits
+		w1,w2: words as received
+		synconly: only stop at words where w2 contains a sync-pattern
+	returns:
+		w1,w2: words as received
+		n: number of bits processed
+		found: True if both words have a valid parity after 'n' bits
+	"""
+
+	# local copies of the syndrome tables (faster lookup in the loop)
+	stlo,sthi=__syndromelo,__syndromehi
+
+	n=0
+	for c in bits:
+		n+=1
+
+		# create two 32-bit words (copy 29th bit of w1 to 0th bit of w2)
+		w2 = ((w2 << 1) | ((w1 >> 29) & 0x01)) & 0xffffffff
+		w1 = ((w1 << 1) ^ (c&0x01)) & 0xffffffff
+
+		# cheap test first: preamble in bits 29 to 22 of w2 (inverted if bit 30 is a '1')
+		if synconly and (w2 >> 22) & 0x1ff not in (0x066,0x199): continue
+
+		# check parity of w1, then w2
+		if stlo[w1 & 0xffff] ^ sthi[w1 >> 16]: continue
+		if stlo[w2 & 0xffff] ^ sthi[w2 >> 16]: continue
+
+		return w1,w2,n,True
+	#end for
+
+	return w1,w2,n,False
+#end scanbits
+
+
+def __findsync(bits, w1,w2):
+	"""
+	shift bits into w1 and w2 until w2 contains a valid sync-pattern
+	(same as __scanbits, but words with a valid parity without sync-pattern are skipped)
+	params:
+		bits: input bits
+		w1,w2: words as received
+	returns:
+		w1,w2: words as received
+		n: number of bits processed
+		found: True if both words are valid and w2 contains a sync-pattern after 'n' bits
+	"""
+
+	# the preamble is in bits 29 to 22 of w2, preceded by the last pre-bit (bit 30)
+	# i.e. the bits received 61 to 53 bits ago. A preamble that started in earlier
+	# data can end up in w2 during the first 60 bits, these are checked bit per bit
+	w1,w2,n,found=__scanbits(bits[:60],w1,w2,True)
+	if found: return w1,w2,n,True
+
+	if n == len(bits): return w1,w2,n,False
+
+	# after that, search the pre-bit + preamble (or the inverted preamble) in the
+	# bits and only check the words where it is in the right position.
+	# The words are rebuilt from the last 62 bits (w1 = bits 31 to 0, w2 = bits 61 to 30)
+	bitstr=bytes(bits).translate(__bitchars)
+	v=(w2 << 30) | (w1 & 0x3fffffff)
+
+	p=0
+	while True:
+		p1=bitstr.find(b'001100110',p)
+		p2=bitstr.find(b'110011001',p)
+		p=p2 if p1 < 0 or 0 <= p2 < p1 else p1
+
+		# no (complete) preamble found anymore, shift in the remaining bits
+		if p < 0 or p+61 > len(bits): break
+
+		# shift in bits up to the position where the preamble is in w2
+		v=((v << (p+61-n)) | int(bitstr[max(n,p-1):p+61],2)) & 0x3fffffffffffffff
+		n=p+61
+		w1=v & 0xffffffff
+		w2=v >> 30
+
+		# check parity of both words
+		if __syndromelo[w1 & 0xffff] == __syndromehi[w1 >> 16] and __syndromelo[w2 & 0xffff] == __syndromehi[w2 >> 16]:
+			return w1,w2,n,True
 		#end if
 
-	#end for (msgword)
+		p+=1
+	#end while
 
-	return w1,w2,ret,l
+	if n < len(bits):
+		v=((v << (len(bits)-n)) | int(bitstr[max(n,len(bits)-62):],2)) & 0x3fffffffffffffff
+	#end if
 
-#end getdataframes
+	return v & 0xffffffff,v >> 30,len(bits),False
+#end findsync
 
 
 def __formatashex6(l):
-	return list(map(lambda x: format(x,'>06x'),l))
+	# same text as printing a list of 6-digit hex strings, without building the list
+	return "[" + ", ".join([f"'{x:06x}'" for x in l]) + "]"
 
-def __formatashex2(l):
-	return list(map(lambda x: format(x,'>02x'),l))
 
 
+def __satcorrections(msg,num,fieldlist):
+	"""
+	extract the satellite corrections of a type 1, 9 or 31 message
+	every 5 frames (120 bits) contain 3 corrections of 40 bits
+	params:
+		msg: data frames
+		num: number of corrections to extract
+		fieldlist: fields of one correction
+	returns:
+		list of corrections (the fields of every correction)
+	"""
+	ret=[]
 
-# main function "DGPS decoder" starts here
-def dgpsdec_mc(mcip=defaultip, mcport=defaultport):
+	for offset in range(0,len(msg),5):
+		# concat (up to) 5 frames into one 120 bit block, missing frames are 0
+		frames=msg[offset:offset+5]
+		block=0
+		for f in frames:
+			block = (block << 24) | f
+		#end for
+		block <<= 24*(5-len(frames))
 
-	# get input bits from multicast stream
-	class getinbits():
-		def __init__ (self,sock):
-			self.buff = []
-			self.bufptr = 0
-			self.bufsize = 0
-			self.sock=sock
-		#end def __init__
+		# extract 3 corrections (the fields are masked, so the bits in front of a correction are ignored)
+		for shift in (80,40,0):
+			if len(ret) == num: return ret
+			ret.append(__extractdata(block >> shift,fieldlist))
+		#end for
+	#end for
 
-		def get(self,n):
-			bits2get=n
-			retbuf=[]
+	return ret
+#end def
 
-			while True:
-				# get data from socket if buffer is empty
-				if self.bufptr == self.bufsize:
-					newbytes = self.sock.recv(10240)
-
-					newbl=len(newbytes)
-					if newbl == 0: continue # try again if no data read
-					
-					# store data in buffer and set pointer and size 
-					self.buff=struct.unpack('B'*newbl,newbytes)
-					self.bufptr=0
-					self.bufsize=newbl
-				#end if
 
-				# get as much data from the buffer as possible
-				nbits=min(bits2get,(self.bufsize-self.bufptr))
+def __scalecorrection(s,psc,rrc):
+	# psc and rrc are signed
+	# scale and round psc and rrc, depending on value of scale-factor s
+	if s == 0: return round(__sext(psc,16)*0.02,2), round(__sext(rrc,8)*0.002,3)
+	return round(__sext(psc,16)*0.32,2), round(__sext(rrc,8)*0.032,3)
+#end def
 
-				retbuf += self.buff[self.bufptr:self.bufptr+nbits] # copy data from buffer
 
-				self.bufptr += nbits # move buffer pointer upwards
-				bits2get -= nbits
+# type 36 character set: 0 to 127 is ascii, 128 to 255 is cyrillic (unicode 0x410 and up)
+__cyrillic=str.maketrans({i: i + (0x410 - 0x80) for i in range(128,256)})
 
-				if bits2get == 0: return retbuf # we have sufficient data, return
 
-				# not yet enough data, get some more
-				continue # return in loop to grab more data
-			#end endless loop
-		#end def get
+# bitrate tables of the type 7/35 and type 27 messages (negative values indicate an error)
+__bitrates_t7=(25,50,100,-3,150,200,-6,-7)
+__bitrates_t27=(25,50,100,200,-4,-5,-6,-7)
 
-	#end class getinbits():
 
+# type 27 station name: position of the 9 characters of 7 bits, first character in the highest bits
+__nameshifts=tuple(range(56,-1,-7))
 
-	# ####################################
-	######################################
-	# main part of the function start here
 
-	# receiving multicast in python, shameless stolen from
-	# https://stackoverflow.com/questions/603852/how-do-you-udp-multicast-in-python
+# message handlers
+# params:
+#	indata: input bits
+#	w1,w2: words as received
+#	count: number of bits received
+#	msgtype, msglen: message type and length (number of frames) from the header
+#	satlist: list of satellites (type 1, 9 and 31 only, None for the other types)
+# returns:
+#	w1,w2: words as received
+#	count: number of bits received
 
-	# assert bind_group in groups + [None], \
-	#     'bind group not in groups to join'
-	sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+# message type 3: ECEF location of the station
+def __msgtype3(indata,w1,w2,count,msgtype,msglen,satlist):
+	if msglen != 4: return w1,w2,count # message should be 4 frames
 
-	# allow reuse of socket (to allow another instance of python to run this
-	# script binding to the same ip/port)
-	sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+	# receive up to 4 frames
+	w1,w2,type3msg,type3msglen=__getdataframes(indata,w1,w2,msglen)
+	count+=type3msglen*30
 
-	sock.bind(('',mcport)) # bind to any ip-address
+	numtype3=int(type3msglen / 4) # how much messages did we receive correctly?
+	print("type  3 message received:",msglen, __formatashex6(type3msg),numtype3)
+	
+	# did we get at a full message?
+	if numtype3 == 1:
+		m=type3msg[0]<<72|type3msg[1]<<48|type3msg[2]<<24|type3msg[3]
+		ecefx,ecefy,ecefz=__extractdata(m,(32,32,32))
 
-	#igmp join
-	mreq=struct.pack('4sl',socket.inet_aton(mcip),socket.INADDR_ANY)
-	sock.setsockopt(socket.IPPROTO_IP,socket.IP_ADD_MEMBERSHIP,mreq)
+		ecefx=__sext(ecefx,32)
+		ecefy=__sext(ecefy,32)
+		ecefz=__sext(ecefz,32)
 
 
-	indata=getinbits(sock)
+		# scale ecefx, ecefy, ecefz
+		ecefx /= 100
+		ecefy /= 100
+		ecefz /= 100
 
+		print("T3",ecefx,ecefy,ecefz)
+	#end if
 
-	#type 9 processor
-	t9=__process_type9()
-	t31=__process_type9()
+	#done
+	return w1,w2,count
+#end def
 
-	#endless loop, break out with 'break' at the end of the file
 
-	# init vars
-	w1=0
-	w2=0
-	count=0
+# message type 6: null message
+def __msgtype6(indata,w1,w2,count,msgtype,msglen,satlist):
+	# null message
+	# note: number of null frames can be 0 or 1
+	if msglen not in (0,1): return w1,w2,count
+	print("type  6 message received:", msglen)
 
-	lastt9cleanup=0
-	lastt31cleanup=0
+	if msglen == 0: return w1,w2,count # length = 0 -> do nothing
 
+	# just get next frame 
+	w1,w2,_,_=__getdataframes(indata,w1,w2,msglen)
+	count+=30
 
-	while True:
-		c=indata.get(1)
-		if not c: break
-		c=c[0]
-		count+=1
-
-		# create two 32-bit words
-		w2 = (w2 << 1) & 0xffffffff
-		if w1 & 0x20000000 != 0: w2 |= 1 # copy 29th bit from w1 to 0th bit of w2
-		w1 = ((w1 << 1) ^ (c&0x01)) & 0xffffffff
+	# done
+	return w1,w2,count
+#end def
 
-		# flip data-bits if last pre-bit (i.e. bit 30) is a '1'
-		w1f = w1 ^ 0x3fffffc0 if w1 & 0x40000000 else w1
-		w2f = w2 ^ 0x3fffffc0 if w2 & 0x40000000 else w2
 
-		# calculate parity
-		par1=__calcpar_i(w1f)
-		par2=__calcpar_i(w2f)
+# message type 5: Constellation health message (GPS)
+def __msgtype5(indata,w1,w2,count,msgtype,msglen,satlist):
 
-		# skip bit if parity does not match
-		if (par1 != w1 & 0x0000003f) or (par2 != w2 & 0x0000003f):
-			continue
-		#end if
+	if msglen == 0:
+		print("type 5 message received:", msglen)
+		return w1,w2,count # length = 0 -> do nothing
+	#end if
 
+	# get all frames
+	w1,w2,type5msg,type5msglen=__getdataframes(indata,w1,w2,msglen)
+	count+=type5msglen*30
 
-		# FEC-check is successfull!
+	print("type 5 message received:",msglen, __formatashex6(type5msg),type5msglen)
 
+	if not type5msg:
+		# no data received, so no data to output
+		return w1,w2,count
+	#end if
 
-		# make good-looking strings
-		w1t=format(w1f & 0xffffffff,'>032b')
-		w2t=format(w2f & 0xffffffff,'>032b')
-		count_t=format(count,'>8d')
+	for m in type5msg:
+		reserved, satid, IssueOfDatalink, DataHealth, CN0, HealthEnable, NewNavData, LossOfSatWarn, TimeToUnhealthy, Unassigned=__extractdata(m,(1,5,1,3,5,1,1,1,4,2))
 
-		# create data-records (remove the 2 trailing pre-bits, and the parity/fec data)
-		w1r=(w1f & 0x3fffffc0) >> 6 
-		w2r=(w2f & 0x3fffffc0) >> 6
+		# C/No: 00000 = untraced, else: 24 dB(Hz) + cno
+		if CN0 > 0: CN0 += 24
 
-		# do we have a sync-pattern?
-		sync = True if w2r >> 16 == 0b01100110 else False
+		# time to unhealty: scale-factor = 5 minutes (300 seconds)
+		TimeToUnhealthy *= 300
 
-		if not sync:
-			# not a sync-pattern, print out if debugging enabled
-			if DEBUG: print(' ',count_t,w1t,w2t, flush=True)
-			continue
-		#end if
+		print("T5",satid,IssueOfDatalink, DataHealth, CN0, HealthEnable, NewNavData, LossOfSatWarn, TimeToUnhealthy, reserved, Unassigned)
+	#end for
+	print()
+	# done
+	return w1,w2,count
+#end def
 
-		# We have a sync-pattern, now extract data from the header
-		msgtype,stationid=__extractdata(w2r,(6,10))
-		mod_z, seq, msglen, stationhealth = __extractdata(w1r,(13,3,5,3))
 
-		#scale modified_Z 
-		mod_z *= 0.6
+# message type 36: special message (glonass)
+def __msgtype36(indata,w1,w2,count,msgtype,msglen,satlist):
 
-		print('S',count_t, end=' ')
+	if msglen == 0:
+		print("type 36 message received:", msglen)
+		return w1,w2,count # length = 0 -> do nothing
 
-		if DEBUG: print(w1t,w2t,end=' ')
+	# just get next frame 
+	w1,w2,type36msg,type36msglen=__getdataframes(indata,w1,w2,msglen)
+	count+=type36msglen*30
 
-		print(msgtype,stationid,round(mod_z,1),seq,msglen,stationhealth, flush=True)
+	print("type 36 message received:",msglen, __formatashex6(type36msg),type36msglen)
+	if not type36msg:
+		# no data received, so no data to output
+		return w1,w2,count
+	#end if
 
+	# every frame contains 3 characters (8 bits)
+	s=b''.join([m.to_bytes(3,'big') for m in type36msg])
 
+	# convert cyrillic from 8bit time (see page 14 - table 4 of Rec, ITU-R M.823-3) to unicode
+	print("T36",s.decode('latin-1').translate(__cyrillic))
+	
+	# done
+	return w1,w2,count
+#end def
 
-		# type 3 message: ECEF location of the station
-		if msgtype == 3:
-			if msglen != 4: continue # message should be 4 frames
 
-			# receive up to 4 frames
-			w1,w2,type3msg,type3msglen=__getdataframes(indata,w1,w2,msglen)
-			count+=type3msglen*30
+# message type 7: station information (GPS)
+# message type 35: station information (glonass)
+def __msgtype7(indata,w1,w2,count,msgtype,msglen,satlist):
+	if msglen % 3 != 0: return w1,w2,count # length must be multiple of 3
 
-			numtype3=int(type3msglen / 4) # how much messages did we receive correctly?
-			print("type  3 message received:",msglen, __formatashex6(type3msg),numtype3)
-			
-			# did we get at a full message?
-			if numtype3 == 1:
-				m=type3msg[0]<<72|type3msg[1]<<48|type3msg[2]<<24|type3msg[3]
-				ecefx,ecefy,ecefz=__extractdata(m,(32,32,32))
+	# read up to 'msglen' frames
+	w1,w2,type7msg,type7msglen=__getdataframes(indata,w1,w2,msglen)
+	count+=type7msglen*30
 
-				if ecefx > 0x80000000: ecefx=-(0x100000000-ecefx)
-				if ecefy > 0x80000000: ecefy=-(0x100000000-ecefy)
-				if ecefz > 0x80000000: ecefz=-(0x100000000-ecefz)
+	numtype7=int(type7msglen/3) # how much messages did we receive correctly?
+	if msgtype == 7:
+		print("type  7 message received:",msglen, __formatashex6(type7msg),numtype7)
+	else:
+		print("type 35 message received:",msglen, __formatashex6(type7msg),numtype7)
+	#end if
 
+	cnt=0
+	for _ in range(numtype7):
+		t=type7msg[cnt:cnt+3]
+		cnt+=3
 
-				# scale ecefx, ecefy, ecefz
-				ecefx /= 100
-				ecefy /= 100
-				ecefz /= 100
+		m=t[0]<<48|t[1]<<24|t[2] # concat 3 frames into 1 message
+		lat,lon,brange,freq,health,statid,bitrate,modmode,synctype,bcoding=__extractdata(m,(16,16,10,12,3,9,3,1,1,1))
 
-				print("T3",ecefx,ecefy,ecefz)
-			#end if
+		# lat and lon are signed
+		lat=__sext(lat,16)
+		lon=__sext(lon,16)
 
-			#done
-			continue
-		#end if (msgtype 3)
+		# scale lat, lon and freq
+		lat = lat * 0.002747
+		lon = lon * 0.005493
+		freq = freq * 0.1 + 190
 
-		# message type 6: null message
-		if msgtype == 6:
-			# null message
-			# note: number of null frames can be 0 or 1
-			if msglen not in (0,1): continue
-			print("type  6 message received:", msglen)
+		# bitrate is table (negative values indicates an error)
+		bitrate=__bitrates_t7[bitrate]
 
-			if msglen == 0: continue # length = 0 -> do nothing
+		print("T"+str(msgtype),round(lat,7),round(lon,7),brange,freq,health,statid,bitrate,modmode,synctype,bcoding)
+	#end for
 
-			# just get next frame 
-			w1,w2,_,_=__getdataframes(indata,w1,w2,msglen)
-			count+=30
+	# done
+	return w1,w2,count
+#end def
 
-			# done
-			continue
-		#end if (msgtype 6)
- 
-		# message type 5: Constellation health message (GPS)
-		if msgtype == 5:
-
-			if msglen == 0:
-				print("type 5 message received:", msglen)
-				continue # length = 0 -> do nothing
-			#end if
 
-			# get all frames
-			w1,w2,type5msg,type5msglen=__getdataframes(indata,w1,w2,msglen)
-			count+=type5msglen*30
+# message type 1: GPS correction data
+def __msgtype1(indata,w1,w2,count,msgtype,msglen,satlist):
+	# type 1 messages are length n*5 + (0, 2 or 4)
+	expectedlen_t19 = (0,2,4)
+	if msglen % 5 not in expectedlen_t19: return w1,w2,count #expect message length of n * 5 + 0, 2, 4
 
-			print("type 5 message received:",msglen, __formatashex6(type5msg),type5msglen)
+	# read up to "msglen" frames
+	w1,w2,type1msg,type1msglen=__getdataframes(indata,w1,w2,msglen)
 
-			if not type5msg:
-				# no data received, so no data to output
-				continue
-			#end if
 
-			for m in type5msg:
-				reserved, satid, IssueOfDatalink, DataHealth, CN0, HealthEnable, NewNavData, LossOfSatWarn, TimeToUnhealthy, Unassigned=__extractdata(m,(1,5,1,3,5,1,1,1,4,2))
+	type1msglenrem5=type1msglen%5
+	type1msglendiv5=int(type1msglen/5)
 
-				# C/No: 00000 = untraced, else: 24 dB(Hz) + cno
-				if CN0 > 0: CN0 += 24
+	count+=type1msglen*30
 
-				# time to unhealty: scale-factor = 5 minutes (300 seconds)
-				TimeToUnhealthy *= 300
+	numtype1=type1msglendiv5*3+(0, 0, 1, 1, 2)[type1msglenrem5]  # how much messages did we receive correctly?
 
-				print("T5",satid,IssueOfDatalink, DataHealth, CN0, HealthEnable, NewNavData, LossOfSatWarn, TimeToUnhealthy, reserved, Unassigned)
-			#end for
-			print()
-			# done
-			continue
-		#end if (msgtype 5)
+	print("type  1 message received:",msglen, __formatashex6(type1msg),numtype1)
 
-		# message type 36: special message (glonass)
-		if msgtype == 36:
+	# parse every message
+	for s, udre, satid, psc, rrc, iod in __satcorrections(type1msg,numtype1,(1,2,5,16,8,8)):
+		psc,rrc=__scalecorrection(s,psc,rrc)
 
-			if msglen == 0:
-				print("type 36 message received:", msglen)
-				continue # length = 0 -> do nothing
+		print("T1Sat ",satid,s,udre,psc,rrc,iod)
+		satlist.update(satid,s,udre,psc,rrc,iod,count,1)
 
-			# just get next frame 
-			w1,w2,type36msg,type36msglen=__getdataframes(indata,w1,w2,msglen)
-			count+=type36msglen*30
+	#end for
 
-			print("type 36 message received:",msglen, __formatashex6(type36msg),type36msglen)
-			if not type36msg:
-				# no data received, so no data to output
-				continue
-			#end if
+	# print out all information about all known satellites
+	satlist.printall(1)
 
-			s=[]
-			for m in type36msg:
-				strchars=__extractdata(m,(8,8,8))
-				s+=strchars
-			#end for
-
-			# convert cyrillic from 8bit time (see page 14 - table 4 of Rec, ITU-R M.823-3) to unicode
-			sc=[x if x < 128 else x + (0x410 - 0x80) for x in s]
-			print("T36",''.join(map(chr,sc)))
-			
-			# done
-			continue
-		#end if (msgtype 36)
-
-		# message type 7: station information (GPS)
-		# message type 35: station information (glonass)
-		#if msgtype == 7:
-		if msgtype in (7,35):
-			if msglen % 3 != 0: continue # length must be multiple of 3
-
-			# read up to 'msglen' frames
-			w1,w2,type7msg,type7msglen=__getdataframes(indata,w1,w2,msglen)
-			count+=type7msglen*30
-
-			numtype7=int(type7msglen/3) # how much messages did we receive correctly?
-			if msgtype == 7:
-				print("type  7 message received:",msglen, __formatashex6(type7msg),numtype7)
-			else:
-				print("type 35 message received:",msglen, __formatashex6(type7msg),numtype7)
-			#end if
+	# do a cleanup of the satellite-list every 1000 words
+	if count - satlist.lastcleanup > 1000:
+		satlist.lastcleanup=count
+		satlist.cleanup(count,1)
+	#end if
 
-			cnt=0
-			for _ in range(numtype7):
-				t=type7msg[cnt:cnt+3]
-				cnt+=3
+	# done
+	return w1,w2,count
+#end def
 
-				m=t[0]<<48|t[1]<<24|t[2] # concat 3 frames into 1 message
-				lat,lon,brange,freq,health,statid,bitrate,modmode,synctype,bcoding=__extractdata(m,(16,16,10,12,3,9,3,1,1,1))
 
-				# lat and lon are signed
-				if lat > 0x8000: lat=-(0x10000-lat)
-				if lon > 0x8000: lon=-(0x10000-lon)
+# message type 9: GPS correction data
+def __msgtype9(indata,w1,w2,count,msgtype,msglen,satlist):
+	expectedlen_t19 = (2,4,5)
+	if msglen not in expectedlen_t19: return w1,w2,count #expect message length of 2, 4 or 5
 
-				# scale lat, lon and freq
-				lat = lat * 0.002747
-				lon = lon * 0.005493
-				freq = freq * 0.1 + 190
+	# read up to "msglen" frames
+	w1,w2,type9msg,type9msglen=__getdataframes(indata,w1,w2,msglen)
+	count+=type9msglen*30
 
-				# bitrate is table (negative values indicates an error)
-				bitrate=(25,50,100,-3,150,200,-6,-7)[bitrate]
+	numtype9=(0,0,1,1,2,3)[type9msglen]  # how much messages did we receive correctly?
 
-				print("T"+str(msgtype),round(lat,7),round(lon,7),brange,freq,health,statid,bitrate,modmode,synctype,bcoding)
-			#end for
+	print("type  9 message received:",msglen, __formatashex6(type9msg),numtype9)
 
-			# done
-			continue
-		# end if (msgtype 7)
+	# parse every message
+	for s, udre, satid, psc, rrc, iod in __satcorrections(type9msg,numtype9,(1,2,5,16,8,8)):
+		psc,rrc=__scalecorrection(s,psc,rrc)
 
+		print("T9Sat ",satid,s,udre,psc,rrc,iod)
+		satlist.update(satid,s,udre,psc,rrc,iod,count,9)
 
-		# message type 1: GPS correction data
-		if msgtype == 1:
-			# type 1 messages are length n*5 + (0, 2 or 4)
-			expectedlen_t19 = (0,2,4)
-			if msglen % 5 not in expectedlen_t19: continue #expect message length of n * 5 + 0, 2, 4
+	#end for
 
-			# read up to "msglen" frames
-			w1,w2,type1msg,type1msglen=__getdataframes(indata,w1,w2,msglen)
+	# print out all information about all known satellites
+	satlist.printall(9)
 
+	# do a cleanup of the satellite-list every 1000 words
+	if count - satlist.lastcleanup > 1000:
+		satlist.lastcleanup=count
+		satlist.cleanup(count,9)
+	#end if
 
-			type1msglenrem5=type1msglen%5
-			type1msglendiv5=int(type1msglen/5)
+	# done
+	return w1,w2,count
+#end def
 
-			count+=type1msglen*30
 
-			numtype1=type1msglendiv5*3+(0, 0, 1, 1, 2)[type1msglenrem5]  # how much messages did we receive correctly?
+# message type 31: glonass correction data
+def __msgtype31(indata,w1,w2,count,msgtype,msglen,satlist):
+	# type 31 messages are length n*5 + (0, 2 or 4)
+	expectedlen_t31 = (0,2,4)
+	if msglen % 5 not in expectedlen_t31: return w1,w2,count #expect message length of n * 5 + 0, 2, 4
 
-			print("type  1 message received:",msglen, __formatashex6(type1msg),numtype1)
+	# read up to "msglen" frames
+	w1,w2,type31msg,type31msglen=__getdataframes(indata,w1,w2,msglen)
 
-			# parse every message
-			for msgt1 in range(numtype1):
-				d3=int(msgt1/3)
-				offset=d3*5
-				r3=msgt1%3
-				
-				if r3 == 0:
-					m=type1msg[0+offset]<<24|type1msg[1+offset]
-					fieldlist=(1,2,5,16,8,8,8)
-				elif r3 == 1:
-					m=type1msg[1+offset]<<48|type1msg[2+offset]<<24|type1msg[3+offset]
-					fieldlist=(1,2,5,16,8,8,16)
-				else:
-					# r3 == 2:
-					m=type1msg[3+offset]<<24|type1msg[4+offset]
-					fieldlist=(1,2,5,16,8,8,0)
-				#end else - elif - if
-
-				s, udre, satid, psc, rrc, iod,_= __extractdata(m,fieldlist)
-
-				# psc and rrc are signed
-				if psc >=0x8000: psc = -(0x10000-psc)
-				if rrc >=0x80: rrc = -(0x100-rrc)
-
-				# scale and round psc and rrc, depending on value of scale-factor s
-				psc = round(psc*0.02,2) if s == 0 else round(psc*0.32,2)
-				rrc = round(rrc*0.002,3) if s == 0 else round(rrc*0.032,3)
-
-				print("T1Sat ",satid,s,udre,psc,rrc,iod)
-				t9.update(satid,s,udre,psc,rrc,iod,count,1)
-
-			#end for
-
-			# print out all information about all known satellites
-			t9.printall(1)
-
-			# do a cleanup of the satellite-list every 1000 words
-			if count - lastt9cleanup > 1000:
-				lastt9cleanup=count
-				t9.cleanup(count,1)
-			#end if
 
-			# done
-			continue
-		#end if (msgtype 1)
+	type31msglenrem5=type31msglen%5
+	type31msglendiv5=int(type31msglen/5)
 
-		# message type 9: GPS correction data
-		if msgtype == 9:
-			expectedlen_t19 = (2,4,5)
-			if msglen not in expectedlen_t19: continue #expect message length of 2, 4 or 5
+	count+=type31msglen*30
 
-			# read up to "msglen" frames
-			w1,w2,type9msg,type9msglen=__getdataframes(indata,w1,w2,msglen)
-			count+=type9msglen*30
+	numtype31=type31msglendiv5*3+(0, 0, 1, 1, 2)[type31msglenrem5]  # how much messages did we receive correctly?
 
-			numtype9=(0,0,1,1,2,3)[type9msglen]  # how much messages did we receive correctly?
+	print("type 31 message received:",msglen, __formatashex6(type31msg),numtype31)
 
-			print("type  9 message received:",msglen, __formatashex6(type9msg),numtype9)
+	# parse every message
+	for s, udre, satid, psc, rrc, r, tb in __satcorrections(type31msg,numtype31,(1,2,5,16,8,1,7)):
+		psc,rrc=__scalecorrection(s,psc,rrc)
 
-			# parse every message
-			for msgt9 in range(numtype9):
-				if msgt9 == 0:
-					m=type9msg[0]<<24|type9msg[1]
-					fieldlist=(1,2,5,16,8,8,8)
-				elif msgt9 == 1:
-					m=type9msg[1]<<48|type9msg[2]<<24|type9msg[3]
-					fieldlist=(1,2,5,16,8,8,16)
-				else:
-					#msgt9 == 2
-					m=type9msg[3]<<24|type9msg[4]
-					fieldlist=(1,2,5,16,8,8,0)
-				#end else - elif - if
+		print("T31Sat ",satid,s,udre,psc,rrc,r,tb)
+		satlist.update(satid,s,udre,psc,rrc,tb,count,31)
 
-				s, udre, satid, psc, rrc, iod,_= __extractdata(m,fieldlist)
+	#end for
+	# print out all information about all known satellites
+	satlist.printall(31)
 
-				# psc and rrc are signed
-				if psc >=0x8000: psc = -(0x10000-psc)
-				if rrc >=0x80: rrc = -(0x100-rrc)
+	# do a cleanup of the satellite-list every 1000 words
+	if count - satlist.lastcleanup > 1000:
+		satlist.lastcleanup=count
+		satlist.cleanup(count,31)
+	#end if
 
-				# scale and round psc and rrc, depending on value of scale-factor s
-				psc = round(psc*0.02,2) if s == 0 else round(psc*0.32,2)
-				rrc = round(rrc*0.002,3) if s == 0 else round(rrc*0.032,3)
+	# done
+	return w1,w2,count
+#end def
 
-				print("T9Sat ",satid,s,udre,psc,rrc,iod)
-				t9.update(satid,s,udre,psc,rrc,iod,count,9)
 
-			#end for
+# message type 27: radio almanac (information about station and other stations in same region)
+def __msgtype27(indata,w1,w2,count,msgtype,msglen,satlist):
+	if msglen%6 != 0: return w1,w2,count # number of frames should a multiple of 6
 
-			# print out all information about all known satellites
-			t9.printall(9)
+	# extract up to 'msglen' frames
+	w1,w2,type27msg,type27msglen=__getdataframes(indata,w1,w2,msglen)
+	count+=type27msglen*30
 
-			# do a cleanup of the satellite-list every 1000 words
-			if count - lastt9cleanup > 1000:
-				lastt9cleanup=count
-				t9.cleanup(count,9)
-			#end if
+	numtype27=int(type27msglen/6)  # how much messages did we receive correctly?
+	print("type 27 message received:",msglen, __formatashex6(type27msg),numtype27)
 
-			# done
-			continue
-		#end if (msgtype 9)
+	cnt=0
+	# go over every message
+	for _ in range(numtype27):
+		t=type27msg[cnt:cnt+6]
+		cnt+=6
 
-		# message type 31: glonass correction data
-		if msgtype == 31:
-			# type 31 messages are length n*5 + (0, 2 or 4)
-			expectedlen_t31 = (0,2,4)
-			if msglen % 5 not in expectedlen_t31: continue #expect message length of n * 5 + 0, 2, 4
+		# concat all 6 frames into one 144 bit integer
+		m=t[0]<<120|t[1]<<96|t[2]<<72|t[3]<<48|t[4]<<24|t[5]
 
-			# read up to "msglen" frames
-			w1,w2,type31msg,type31msglen=__getdataframes(indata,w1,w2,msglen)
+		#extract data + tempory storage for the station name
+		lat,lon,refid1,freq,op,refid2,bitrate,dat,r,bc,integr,const,txt= __extractdata(m,(16,16,10,12,2,10,3,1,1,1,2,7,63))
 
+		#extract station name: 9 times 1 character (7 bits ascii, 0 is printed as '_')
+		name=bytes([(txt >> shift) & 0x7f for shift in __nameshifts]).decode('ascii').replace('\x00','_')
 
-			type31msglenrem5=type31msglen%5
-			type31msglendiv5=int(type31msglen/5)
+		# lat and lon are signed
+		lat=__sext(lat,16)
+		lon=__sext(lon,16)
 
-			count+=type31msglen*30
+		# scale: lat, lon and freq
+		lat = lat * 0.002747
+		lon = lon * 0.005493
+		freq = freq * 0.1 + 190
+
+		# bitrate is a list  (negative values indicates an error
+		bitrate=__bitrates_t27[bitrate]
+
+		print("T27",round(lat,7),round(lon,7),refid1,refid2,freq,op,bitrate,dat,r,bc,integr,const,name)
+	#end for
+
+	# done
+	return w1,w2,count
+#end def
 
-			numtype31=type31msglendiv5*3+(0, 0, 1, 1, 2)[type31msglenrem5]  # how much messages did we receive correctly?
 
-			print("type 31 message received:",msglen, __formatashex6(type31msg),numtype31)
+# message handler per message type
+__msghandlers={
+	1: __msgtype1,
+	3: __msgtype3,
+	5: __msgtype5,
+	6: __msgtype6,
+	7: __msgtype7,
+	9: __msgtype9,
+	27: __msgtype27,
+	31: __msgtype31,
+	35: __msgtype7,
+	36: __msgtype36,
+}
 
-			# parse every message
-			for msgt31 in range(numtype31):
-				d3=int(msgt31/3)
-				offset=d3*5
-				r3=msgt31%3
+
+# main function "DGPS decoder" starts here
+def dgpsdec_mc(mcip=defaultip, mcport=defaultport):
+
+	# get input bits from multicast stream
+	class getinbits():
+		def __init__ (self,sock):
+			self.buff = memoryview(b'')
+			self.bufptr = 0
+			self.bufsize = 0
+			self.sock=sock
+
+			# preallocated receive buffer, filled with recv_into
+			self.rxbuff = memoryview(bytearray(65536))
+		#end def __init__
+
+		def fill(self):
+			# get data from socket (until some data is read)
+			# note: this overwrites the data of the previous datagram(s)
+			while True:
+				# all output for the received data is done: flush it before waiting for new data
+				sys.stdout.flush()
+
+				newbl = self.sock.recv_into(self.rxbuff[:10240])
+
+				if newbl == 0: continue # try again if no data read
+
+				# also read all datagrams that are already waiting (without blocking),
+				# so a burst of datagrams is processed in one go
+				if hasattr(socket,"MSG_DONTWAIT"):
+					while newbl + 10240 <= len(self.rxbuff):
+						try:
+							newbl += self.sock.recv_into(self.rxbuff[newbl:newbl+10240],10240,socket.MSG_DONTWAIT)
+						except BlockingIOError:
+							break
+						#end try
+					#end while
+				#end if
 				
-				if r3 == 0:
-					m=type31msg[0+offset]<<24|type31msg[1+offset]
-					fieldlist=(1,2,5,16,8,1,7,8)
-				elif r3 == 1:
-					m=type31msg[1+offset]<<48|type31msg[2+offset]<<24|type31msg[3+offset]
-					fieldlist=(1,2,5,16,8,1,7,16)
-				else:
-					# r3 == 2:
-					m=type31msg[3+offset]<<24|type31msg[4+offset]
-					fieldlist=(1,2,5,16,8,1,7,0)
-				#end else - elif - if
-
-				s, udre, satid, psc, rrc,r, tb,_= __extractdata(m,fieldlist)
-
-				# psc and rrc are signed
-				if psc >=0x8000: psc = -(0x10000-psc)
-				if rrc >=0x80: rrc = -(0x100-rrc)
-
-				# scale and round psc and rrc, depending on value of scale-factor s
-				psc = round(psc*0.02,2) if s == 0 else round(psc*0.32,2)
-				rrc = round(rrc*0.002,3) if s == 0 else round(rrc*0.032,3)
-
-				print("T31Sat ",satid,s,udre,psc,rrc,r,tb)
-				t31.update(satid,s,udre,psc,rrc,tb,count,31)
-
-			#end for
-			# print out all information about all known satellites
-			t31.printall(31)
-
-			# do a cleanup of the satellite-list every 1000 words
-			if count - lastt31cleanup > 1000:
-				lastt31cleanup=count
-				t31.cleanup(count,31)
+				# set buffer, pointer and size 
+				# (a memoryview on the receive buffer, so slices do not copy the data)
+				self.buff=self.rxbuff[:newbl]
+				self.bufptr=0
+				self.bufsize=newbl
+				return
+			#end endless loop
+		#end def fill
+
+		def peek(self):
+			# return all data in the buffer, without consuming it
+			if self.bufptr == self.bufsize: self.fill()
+			return self.buff[self.bufptr:self.bufsize]
+		#end def peek
+
+		def skip(self,n):
+			# consume 'n' bits (previously returned by peek)
+			self.bufptr += n
+		#end def skip
+
+		def get(self,n):
+			# shortcut: all data is in the buffer, return a slice of the buffer
+			if self.bufsize - self.bufptr >= n:
+				self.bufptr += n
+				return self.buff[self.bufptr-n:self.bufptr]
 			#end if
 
-			# done
-			continue
-		#end if
+			# data spans multiple datagrams, copy it in a new buffer
+			bits2get=n
+			retbuf=bytearray(n)
+			retptr=0
+
+			while True:
+				# get data from socket if buffer is empty
+				if self.bufptr == self.bufsize: self.fill()
+
+				# get as much data from the buffer as possible
+				nbits=min(bits2get,(self.bufsize-self.bufptr))
+
+				retbuf[retptr:retptr+nbits] = self.buff[self.bufptr:self.bufptr+nbits] # copy data from buffer
+
+				self.bufptr += nbits # move buffer pointer upwards
+				retptr += nbits
+				bits2get -= nbits
+
+				if bits2get == 0: return retbuf # we have sufficient data, return
+
+				# not yet enough data, get some more
+				continue # return in loop to grab more data
+			#end endless loop
+		#end def get
+
+	#end class getinbits():
+
+
+	# ####################################
+	######################################
+	# main part of the function start here
+
+	# receiving multicast in python, shameless stolen from
+	# https://stackoverflow.com/questions/603852/how-do-you-udp-multicast-in-python
+
+	# assert bind_group in groups + [None], \
+	#     'bind group not in groups to join'
+	sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+
+	# allow reuse of socket (to allow another instance of python to run this
+	# script binding to the same ip/port)
+	sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+	# large kernel receive buffer, so bursts of data (e.g. when replaying a
+	# recording faster then real-time) are queued instead of dropped
+	sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2*1024*1024)
+
+	sock.bind(('',mcport)) # bind to any ip-address
+
+	#igmp join
+	mreq=struct.pack('4sl',socket.inet_aton(mcip),socket.INADDR_ANY)
+	sock.setsockopt(socket.IPPROTO_IP,socket.IP_ADD_MEMBERSHIP,mreq)
 
-		# message type 27: radio almanac (information about station and other stations in same region)
-		if msgtype == 27:
-			if msglen%6 != 0: continue # number of frames should a multiple of 6
 
-			# extract up to 'msglen' frames
-			w1,w2,type27msg,type27msglen=__getdataframes(indata,w1,w2,msglen)
-			count+=type27msglen*30
+	indata=getinbits(sock)
 
-			numtype27=int(type27msglen/6)  # how much messages did we receive correctly?
-			print("type 27 message received:",msglen, __formatashex6(type27msg),numtype27)
 
-			cnt=0
-			# go over every message
-			for _ in range(numtype27):
-				t=type27msg[cnt:cnt+6]
-				cnt+=6
+	#type 9 processor
+	t9=__process_type9()
+	t31=__process_type9()
 
-				# concal all 6 frames into one 192 bit integer
-				m=0
-				for i in range(6):
-					m<<=24
-					m|=t[i]
-				#end for
+	# list of satellites per message type
+	satlists={1: t9, 9: t9, 31: t31}
 
-				#extract data + tempory storage for the station name
-				lat,lon,refid1,freq,op,refid2,bitrate,dat,r,bc,integr,const,txt= __extractdata(m,(16,16,10,12,2,10,3,1,1,1,2,7,63))
+	#endless loop, break out with 'break' at the end of the file
 
-				#extract station name
-				c=__extractdata(txt,[7 for _ in range(9)]) # extract 9 times 1 character (7 bits) 
-				name="".join(map(lambda x: '_' if x == 0 else chr(x),c))
+	# init vars
+	w1=0
+	w2=0
+	count=0
 
-				# lat and lon are signed
-				if lat > 0x8000: lat=-(0x10000-lat)
-				if lon > 0x8000: lon=-(0x10000-lon)
 
-				# scale: lat, lon and freq
-				lat = lat * 0.002747
-				lon = lon * 0.005493
-				freq = freq * 0.1 + 190
+	# search for all valid words when debugging (these are printed), otherwise
+	# only for sync-patterns
+	scan=__scanbits if DEBUG else __findsync
 
-				# bitrate is a list  (negative values indicates an error
-				bitrate=(25,50,100,200,-4,-5,-6,-7)[bitrate]
+	while True:
+		# shift in all received bits, up to the first bit where both words have a valid parity
+		w1,w2,n,found=scan(indata.peek(),w1,w2)
+		indata.skip(n)
+		count+=n
+
+		# no valid words in the received bits, get more data
+		if not found: continue
 
-				print("T27",round(lat,7),round(lon,7),refid1,refid2,freq,op,bitrate,dat,r,bc,integr,const,name)
-			#end for
 
-			# done
+		# FEC-check is successfull!
+
+		# flip data-bits if last pre-bit (i.e. bit 30) is a '1'
+		w1f = w1 ^ 0x3fffffc0 if w1 & 0x40000000 else w1
+		w2f = w2 ^ 0x3fffffc0 if w2 & 0x40000000 else w2
+
+		# do we have a sync-pattern? (preamble 0b01100110 in bits 29 to 22)
+		if w2f & 0x3fc00000 != 0b01100110 << 22:
+			# not a sync-pattern, print out if debugging enabled
+			if DEBUG: print(' ',format(count,'>8d'),format(w1f,'>032b'),format(w2f,'>032b'))
 			continue
-		# end if (type 27)
+		#end if
+
+		# create data-records (remove the 2 trailing pre-bits, and the parity/fec data)
+		w1r=(w1f & 0x3fffffc0) >> 6 
+		w2r=(w2f & 0x3fffffc0) >> 6
+
+		# We have a sync-pattern, now extract data from the header
+		msgtype,stationid=__extractdata(w2r,(6,10))
+		mod_z, seq, msglen, stationhealth = __extractdata(w1r,(13,3,5,3))
 
+		#scale modified_Z 
+		mod_z *= 0.6
+
+		print('S',format(count,'>8d'), end=' ')
+
+		if DEBUG: print(format(w1f,'>032b'),format(w2f,'>032b'),end=' ')
+
+		print(msgtype,stationid,round(mod_z,1),seq,msglen,stationhealth)
 
 
-		# catchall for unknown message types
-		print("unknown type",msgtype)
 
-		#done
-		continue
+		# decode the message
+		msghandler=__msghandlers.get(msgtype)
+
+		if msghandler is None:
+			# catchall for unknown message types
+			print("unknown type",msgtype)
+			continue
+		#end if
+
+		w1,w2,count=msghandler(indata,w1,w2,count,msgtype,msglen,satlists.get(msgtype))
 
 	#end while (endless loop)
 